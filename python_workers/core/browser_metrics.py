@@ -0,0 +1,142 @@
+import json
+import time
+from pathlib import Path
+
+# Default export location: one JSON line per finished job, under the same
+# <repo>/output root the pipeline writes plans to
+DEFAULT_METRICS_FILE = Path(__file__).parent.parent.parent / "output" / "metrics" / "jobs.jsonl"
+
+# Chromium Performance.getMetrics name -> (our name, scale)
+PERF_COUNTERS = {
+    "JSHeapUsedSize": ("js_heap_used_mb", 1 / (1 << 20)),
+    "JSHeapTotalSize": ("js_heap_total_mb", 1 / (1 << 20)),
+    "Nodes": ("dom_nodes", 1),
+    "Documents": ("documents", 1),
+    "JSEventListeners": ("js_event_listeners", 1),
+    "TaskDuration": ("cpu_sec", 1),
+    "ScriptDuration": ("script_sec", 1),
+    "LayoutDuration": ("layout_sec", 1),
+}
+
+
+class BrowserMetrics:
+    """
+    Samples Chromium performance counters for one page over CDP.
+
+    Sampling happens at step boundaries (sample()) and, while the caller is
+    polling or waiting, at most every `interval` seconds (tick()). Playwright's
+    sync API is not thread-safe, so there is no background sampler thread.
+
+    Network bytes are the encoded (on-the-wire) sizes of finished responses.
+    """
+
+    def __init__(self, page, interval: float = 5.0):
+        self.page = page
+        self.interval = interval
+        self.samples = []
+        self.network_bytes = 0
+        self._last_sample = 0.0
+        self._started = time.monotonic()
+
+        self.cdp = page.context.new_cdp_session(page)
+        self.cdp.send("Performance.enable")
+        self.cdp.send("Network.enable")
+        self.cdp.on("Network.loadingFinished", self._on_loading_finished)
+
+    def _on_loading_finished(self, event):
+        self.network_bytes += int(event.get("encodedDataLength", 0))
+
+    def sample(self, label: str = None) -> dict:
+        try:
+            raw = {m["name"]: m["value"] for m in self.cdp.send("Performance.getMetrics")["metrics"]}
+        except Exception as e:
+            print(f"⚠️ [Metrics] Sampling failed: {e}")
+            return {}
+
+        point = {"t": round(time.monotonic() - self._started, 3), "label": label}
+        for name, (key, scale) in PERF_COUNTERS.items():
+            if name in raw:
+                point[key] = round(raw[name] * scale, 3)
+        point["network_mb"] = round(self.network_bytes / (1 << 20), 3)
+
+        self.samples.append(point)
+        self._last_sample = time.monotonic()
+        return point
+
+    def tick(self):
+        """Samples if `interval` seconds have passed since the last sample."""
+        if self.interval and time.monotonic() - self._last_sample >= self.interval:
+            self.sample("interval")
+
+    def summary(self) -> dict:
+        """Peak and final value of every counter (cpu/script/network are cumulative)."""
+        if not self.samples:
+            return {"samples": 0}
+        keys = [k for k in self.samples[-1] if k not in ("t", "label")]
+        return {
+            "samples": len(self.samples),
+            "duration_sec": self.samples[-1]["t"],
+            "peak": {k: max(s.get(k, 0) for s in self.samples) for k in keys},
+            "final": {k: self.samples[-1].get(k, 0) for k in keys},
+        }
+
+    def close(self):
+        try:
+            self.cdp.detach()
+        except Exception:
+            pass
+
+
+def export_job(summary: dict, job: str = None, path: str = None):
+    """Appends one job's summary to the metrics JSONL file."""
+    path = Path(path) if path else DEFAULT_METRICS_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    row = {"job": job, "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"), **summary}
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def _percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    idx = min(len(values) - 1, int(round(q * (len(values) - 1))))
+    return values[idx]
+
+
+def aggregate(path: str = None) -> dict:
+    """
+    Aggregate over exported jobs: p50 / p95 / max of each per-job peak.
+    Use it to size hosts (heap, CPU) and pick concurrency / recycle limits.
+    """
+    path = Path(path) if path else DEFAULT_METRICS_FILE
+    peaks = {}
+    jobs = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            row = json.loads(line)
+            if not row.get("samples"):
+                continue
+            jobs += 1
+            for key, value in row["peak"].items():
+                peaks.setdefault(key, []).append(value)
+
+    return {
+        "jobs": jobs,
+        "peak": {
+            key: {
+                "p50": _percentile(values, 0.5),
+                "p95": _percentile(values, 0.95),
+                "max": max(values),
+            }
+            for key, values in peaks.items()
+        },
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Aggregate browser resource metrics across jobs")
+    parser.add_argument("path", nargs="?", help=f"Metrics JSONL file (default: {DEFAULT_METRICS_FILE})")
+    args = parser.parse_args()
+
+    print(json.dumps(aggregate(args.path), indent=2))
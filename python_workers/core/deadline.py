@@ -0,0 +1,87 @@
+import time
+from typing import Optional
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a job's end-to-end budget runs out."""
+
+    def __init__(self, step: str, report: dict):
+        self.step = step
+        self.report = report
+        super().__init__(f"Deadline exceeded during '{step}' (budget {report['budget_sec']}s, spent {report['spent_sec']}s)")
+
+
+class Deadline:
+    """
+    End-to-end time budget passed through every step of a job.
+
+    Every wait asks the deadline for its timeout instead of using a fixed
+    value, so the job can never run past its budget:
+
+        page.goto(url, timeout=deadline.timeout_ms(30000))
+        deadline.sleep(3)
+
+    Deadline(None) is unlimited and leaves the original timeouts unchanged.
+    """
+
+    def __init__(self, budget_sec: Optional[float] = None):
+        self.budget_sec = budget_sec
+        self.started = time.monotonic()
+        self.expires = self.started + budget_sec if budget_sec is not None else None
+        self.current_step = "start"
+        self._step_started = None
+        self.steps = {}
+
+    @property
+    def bounded(self) -> bool:
+        return self.expires is not None
+
+    def remaining(self) -> float:
+        if self.expires is None:
+            return float("inf")
+        return max(0.0, self.expires - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self):
+        if self.expired():
+            raise DeadlineExceeded(self.current_step, self.report())
+
+    def timeout_ms(self, cap_ms: float) -> int:
+        """cap_ms limited to the remaining budget. Never 0 (Playwright treats 0 as 'no timeout')."""
+        self.check()
+        return max(1, int(min(cap_ms, self.remaining() * 1000)))
+
+    def timeout_sec(self, cap_sec: float) -> float:
+        self.check()
+        return min(cap_sec, self.remaining())
+
+    def sleep(self, sec: float):
+        """Sleeps at most the remaining budget, then fails if it ran out."""
+        time.sleep(min(sec, self.remaining()))
+        self.check()
+
+    def begin(self, name: str):
+        """
+        Marks the start of a step; time from here until end() is attributed to it.
+        A budget that ran out before the step starts is blamed on the previous step.
+        """
+        self.check()
+        self.current_step = name
+        self._step_started = time.monotonic()
+
+    def end(self, name: str):
+        self.steps[name] = round(self.steps.get(name, 0.0) + time.monotonic() - self._step_started, 3)
+
+    def report(self) -> dict:
+        steps = dict(self.steps)
+        if self.current_step not in steps and self._step_started is not None:
+            # Step still in progress (e.g. the one that ran out of budget)
+            steps[self.current_step] = round(time.monotonic() - self._step_started, 3)
+        return {
+            "budget_sec": self.budget_sec,
+            "spent_sec": round(time.monotonic() - self.started, 3),
+            "steps": steps,
+            "exhausted_by": self.current_step if self.expired() else None,
+        }
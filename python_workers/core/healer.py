@@ -3,6 +3,19 @@ import json
 import google.generativeai as genai
 from typing import Optional
 
+try:
+    from .deadline import Deadline, DeadlineExceeded
+except ImportError:
+    from deadline import Deadline, DeadlineExceeded
+
+# Keys that name one element on the page (buttons, inputs, headings). Every other
+# key (post_title, comment_body, ...) is read as a list of matches.
+SINGLE_ELEMENT_KEYS = {"chat_input", "notebook_title", "video_title"}
+
+
+def is_single_element_key(target_key: str) -> bool:
+    return target_key.endswith("_btn") or target_key in SINGLE_ELEMENT_KEYS
+
 class Healer:
     def __init__(self, config_path: str = None):
         if config_path is None:
@@ -20,10 +33,16 @@ class Healer:
         else:
             genai.configure(api_key=api_key)
 
-    def fix_selector(self, html_content: str, target_key: str, platform: str) -> Optional[str]:
+    def fix_selector(self, html_content: str, target_key: str, platform: str, page=None, num_candidates: int = 5,
+                     deadline: Deadline = None) -> Optional[str]:
         """
         AI Doctor that heals broken CSS selectors by analyzing HTML.
+        Asks for several candidates; when a live page is given, all of them are
+        verified in a single page.evaluate and only the best one is persisted.
+        With a bounded deadline, the Gemini call is capped at the remaining budget.
         """
+        deadline = deadline or Deadline()
+        deadline.check()
         print(f"🚑 [Healer] Analyzing HTML to fix '{target_key}' for {platform}...")
 
         try:
@@ -35,7 +54,8 @@ class Healer:
             prompt = f"""
             You are a CSS Selector Expert.
             The current CSS selector for '{target_key}' on {platform} is broken.
-            Analyze the following HTML snippet and provide the CORRECT, MOST ROBUST CSS selector for '{target_key}'.
+            Analyze the following HTML snippet and provide the {num_candidates} best CSS selectors for '{target_key}',
+            ordered from most to least robust.
             
             Target description:
             - If target_key is 'comment_body', look for comment text.
@@ -46,27 +66,139 @@ class Healer:
             - If target_key is 'add_source_btn', look for the button to add a source.
             - If target_key is 'chat_input', look for the main chat input text area.
             
-            Return ONLY the CSS selector string. No markdown, no explanations.
+            Use standard CSS only (it must work with document.querySelectorAll).
+            Return ONLY a JSON array of selector strings. No markdown, no explanations.
 
             HTML Snippet:
             {truncated_html}
             """
 
-            response = model.generate_content(prompt)
-            new_selector = response.text.strip()
+            try:
+                if deadline.bounded:
+                    response = model.generate_content(prompt, request_options={"timeout": deadline.timeout_sec(60)})
+                else:
+                    response = model.generate_content(prompt)
+            except DeadlineExceeded:
+                raise
+            except Exception:
+                # A timeout caused by the capped budget surfaces as DeadlineExceeded
+                deadline.check()
+                raise
+            candidates = self._parse_candidates(response.text)
             
-            if new_selector:
-                print(f"✅ [Healer] Diagnose complete. New selector: {new_selector}")
-                self._update_config(platform, target_key, new_selector)
-                return new_selector
-            else:
+            if not candidates:
                 print("❌ [Healer] Failed to generate a new selector.")
                 return None
+            
+            if page is None:
+                # No live page to check against: fall back to the model's first choice
+                new_selector = candidates[0]
+            else:
+                new_selector = self.pick_best(page, candidates, deadline=deadline, target_key=target_key)
+                if not new_selector:
+                    print(f"❌ [Healer] None of {len(candidates)} candidates matched the live page.")
+                    return None
+            
+            print(f"✅ [Healer] Diagnose complete. New selector: {new_selector}")
+            self._update_config(platform, target_key, new_selector)
+            return new_selector
 
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             print(f"❌ [Healer] Error during diagnosis: {e}")
             return None
 
+    @staticmethod
+    def _parse_candidates(text: str) -> list:
+        """
+        Parses the model output (JSON array, fenced JSON or one selector per line).
+        Any other JSON shape (object, number, ...) yields no candidates.
+        """
+        text = text.strip()
+        if text.startswith("```"):
+            text = text.strip("`")
+            text = text[text.find("\n") + 1:] if "\n" in text else text
+        try:
+            data = json.loads(text)
+            if isinstance(data, str):
+                data = [data]
+            elif not isinstance(data, list):
+                return []
+        except ValueError:
+            data = text.splitlines()
+        
+        candidates = []
+        for item in data:
+            if not isinstance(item, str):
+                continue
+            sel = item.strip().strip(",").strip().strip('"').strip("'")
+            if sel and sel not in candidates:
+                candidates.append(sel)
+        return candidates
+
+    # Runs every candidate in one round trip: validity, match count, visibility, query cost
+    _VERIFY_JS = """
+    (selectors) => selectors.map((sel) => {
+        const t0 = performance.now();
+        let nodes;
+        try {
+            nodes = document.querySelectorAll(sel);
+        } catch (e) {
+            return { selector: sel, valid: false, count: 0, visible: 0, cost_ms: 0 };
+        }
+        const cost_ms = performance.now() - t0;
+        let visible = 0;
+        for (const n of nodes) {
+            const r = n.getBoundingClientRect();
+            if (r.width > 0 && r.height > 0) visible++;
+        }
+        return { selector: sel, valid: true, count: nodes.length, visible, cost_ms };
+    })
+    """
+
+    def verify_candidates(self, page, candidates: list, deadline: Deadline = None) -> list:
+        """
+        Checks all candidates against the live page in a single in-page call.
+        page.evaluate has no timeout, so a bounded deadline goes through
+        wait_for_function (the result array is truthy, so it resolves on the first run).
+        """
+        deadline = deadline or Deadline()
+        if not deadline.bounded:
+            return page.evaluate(self._VERIFY_JS, candidates)
+        try:
+            handle = page.wait_for_function(self._VERIFY_JS, arg=candidates, timeout=deadline.timeout_ms(5000))
+            return handle.json_value()
+        except DeadlineExceeded:
+            raise
+        except Exception:
+            deadline.check()
+            raise
+
+    def pick_best(self, page, candidates: list, deadline: Deadline = None, target_key: str = None) -> Optional[str]:
+        """
+        Returns the best verified candidate; it must match something.
+        Single-element keys (see is_single_element_key, or no key given):
+        unique matches win, then visible ones, then fewer matches.
+        List keys: more visible matches win, then more matches.
+        Ties go to the cheaper query, then to the model's own ranking.
+        """
+        results = self.verify_candidates(page, candidates, deadline=deadline)
+        for r in results:
+            status = "invalid" if not r["valid"] else f"{r['count']} match(es), {r['visible']} visible, {r['cost_ms']:.2f}ms"
+            print(f"   🔎 [Healer] {r['selector']} -> {status}")
+        
+        matched = [(i, r) for i, r in enumerate(results) if r["valid"] and r["count"] > 0]
+        if not matched:
+            return None
+        
+        if target_key is None or is_single_element_key(target_key):
+            rank = lambda ir: (ir[1]["count"] != 1, ir[1]["visible"] == 0, ir[1]["count"], ir[1]["cost_ms"], ir[0])
+        else:
+            rank = lambda ir: (-ir[1]["visible"], -ir[1]["count"], ir[1]["cost_ms"], ir[0])
+        _, best = min(matched, key=rank)
+        return best["selector"]
+
     def _update_config(self, platform: str, target_key: str, new_selector: str):
         """
         Updates the JSON config file with the new selector.
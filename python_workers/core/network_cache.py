@@ -0,0 +1,116 @@
+import os
+import json
+import zipfile
+from pathlib import Path
+
+# Default archive location for recorded runs. Kept outside the repo (next to the
+# managed profiles) because recordings of logged-in pages hold personal data.
+DEFAULT_ARCHIVE_DIR = Path.home() / ".cloud-shield" / "network"
+
+# Headers removed from recorded archives; replay matches on URL/method/body, not these
+SENSITIVE_HEADERS = {"cookie", "set-cookie", "authorization"}
+
+MODES = ("off", "record", "replay")
+
+
+class NetworkCache:
+    """
+    Record/replay of network traffic through Playwright's context routing.
+
+    - record: every response the run receives is written to a HAR archive
+              (bodies stored inside the .zip), flushed when the context closes.
+    - replay: matching requests are fulfilled from the archive; nothing hits
+              the live site. Uncached URLs either pass through to the network
+              (passthrough=True) or are aborted for fully offline runs.
+
+    url_filter limits which requests are recorded/replayed (glob or regex),
+    e.g. "**/notebooklm.google.com/**".
+
+    Playwright writes the archive when the context closes; call finalize()
+    after that to strip cookies and auth headers from it. Response bodies
+    are kept, so treat recordings of logged-in sessions as private data.
+    """
+
+    def __init__(self, mode: str = "off", archive: str = None, passthrough: bool = True, url_filter=None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown network cache mode: {mode} (expected one of {MODES})")
+        self.mode = mode
+        self.archive = Path(archive) if archive else DEFAULT_ARCHIVE_DIR / "default.har.zip"
+        self.passthrough = passthrough
+        self.url_filter = url_filter
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def attach(self, context):
+        """Installs the HAR router on a BrowserContext. Call before the first navigation."""
+        if self.mode == "record":
+            self.archive.parent.mkdir(parents=True, exist_ok=True)
+            print(f"📼 [NetCache] Recording network to {self.archive}")
+            print("⚠️ [NetCache] Recorded pages contain account data; cookies are stripped on close, bodies are not.")
+            context.route_from_har(
+                str(self.archive),
+                url=self.url_filter,
+                update=True,
+                update_content="embed" if self.archive.suffix == ".har" else "attach",
+                update_mode="full",
+            )
+        elif self.mode == "replay":
+            if not self.archive.exists():
+                raise FileNotFoundError(f"❌ [NetCache] Archive not found: {self.archive}. Run once with mode='record'.")
+            print(f"▶️ [NetCache] Replaying network from {self.archive} (passthrough: {self.passthrough})")
+            context.route_from_har(
+                str(self.archive),
+                url=self.url_filter,
+                not_found="fallback" if self.passthrough else "abort",
+            )
+
+
+    def finalize(self):
+        """Scrubs credentials from a freshly recorded archive. Call after context.close()."""
+        if self.mode == "record" and self.archive.exists():
+            removed = scrub_archive(self.archive)
+            print(f"🧽 [NetCache] Removed {removed} credential header(s)/cookie list(s) from {self.archive.name}")
+
+
+def _scrub_har(har: dict) -> int:
+    removed = 0
+    for entry in har.get("log", {}).get("entries", []):
+        for part in (entry.get("request", {}), entry.get("response", {})):
+            headers = part.get("headers", [])
+            kept = [h for h in headers if h.get("name", "").lower() not in SENSITIVE_HEADERS]
+            removed += len(headers) - len(kept)
+            part["headers"] = kept
+            if part.get("cookies"):
+                removed += 1
+                part["cookies"] = []
+    return removed
+
+
+def scrub_archive(path) -> int:
+    """
+    Removes cookie / set-cookie / authorization headers and parsed cookie
+    lists from a .har or .har.zip archive in place. Returns how many were removed.
+    """
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+
+    if path.suffix == ".har":
+        har = json.loads(path.read_text(encoding="utf-8"))
+        removed = _scrub_har(har)
+        tmp.write_text(json.dumps(har), encoding="utf-8")
+    else:
+        removed = 0
+        with zipfile.ZipFile(path) as src, zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as dst:
+            for info in src.infolist():
+                data = src.read(info)
+                if info.filename.endswith(".har"):
+                    har = json.loads(data)
+                    removed += _scrub_har(har)
+                    data = json.dumps(har).encode("utf-8")
+                dst.writestr(info, data)
+
+    os.chmod(tmp, 0o600)  # bodies may still hold account data
+    os.replace(tmp, path)
+    return removed
@@ -0,0 +1,299 @@
+import os
+import sys
+import json
+from typing import Iterator, Optional
+
+CHUNK_SIZE = 1 << 20  # 1 MiB
+JSONL_LINE_LIMIT = 1 << 20  # longest first line still checked for the JSON-lines layout
+WHITESPACE = " \t\r\n"
+
+_decoder = json.JSONDecoder()
+
+
+class _Reader:
+    """
+    Incremental JSON value reader over a text file.
+    Only the unparsed tail of the file is kept in memory.
+    """
+
+    def __init__(self, f, chunk_size: int = None):
+        self.f = f
+        self.chunk_size = chunk_size or CHUNK_SIZE
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop what has already been consumed before growing the buffer
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at EOF)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos}, got '{self.peek()}'")
+        self.pos += 1
+
+    def value(self):
+        """Decodes the next complete JSON value, reading more input as needed."""
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+                # A number touching the end of the buffer may continue in the next chunk
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+    def line_value(self, limit: int):
+        """
+        Decodes the value on the current line if it is complete and alone on
+        that line (the JSON-lines shape). Only looks at lines up to `limit`
+        characters, so a huge minified document is never buffered whole.
+        Returns (True, value) and consumes it, or (False, None).
+        """
+        self.peek()
+        while "\n" not in self.buf[self.pos:] and not self.eof and len(self.buf) - self.pos <= limit:
+            self._fill()
+        nl = self.buf.find("\n", self.pos)
+        line_end = nl if nl != -1 else len(self.buf)
+        if line_end - self.pos > limit or (nl == -1 and not self.eof):
+            return False, None
+        try:
+            obj, end = _decoder.raw_decode(self.buf[:line_end], self.pos)
+        except json.JSONDecodeError:
+            return False, None
+        if self.buf[end:line_end].strip(WHITESPACE):
+            return False, None
+        self.pos = end
+        return True, obj
+
+    def array_items(self) -> Iterator:
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            sep = self.peek()
+            self.pos += 1
+            if sep == "]":
+                return
+            if sep != ",":
+                raise ValueError(f"Malformed JSON array near offset {self.pos}")
+
+
+def iter_records(path: str) -> Iterator:
+    """
+    Lazily yields pain-point records from any of the supported layouts:
+    - JSON array:            [ ... ] (several in a row are read one after another)
+    - wrapped object:        {"pain_points": [ ... ], ...}
+    - JSON-lines / NDJSON:   one record per line
+    A file whose first line holds one complete object is read as JSON-lines
+    (even if that record has its own "pain_points" field), unless it is the
+    only value in the file.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        reader = _Reader(f)
+        first = reader.peek()
+
+        if first == "[":
+            # Scrapers that append one array per run leave several arrays back to back
+            while reader.peek():
+                if reader.peek() == "[":
+                    yield from reader.array_items()
+                else:
+                    yield reader.value()
+            return
+
+        if first != "{":
+            # JSONL of bare strings, or anything else decodable value by value
+            while reader.peek():
+                yield reader.value()
+            return
+
+        # One complete object on the first line: JSON-lines, or a small one-line document
+        found, obj = reader.line_value(limit=JSONL_LINE_LIMIT)
+        if found:
+            if reader.peek():
+                yield obj
+                while reader.peek():
+                    yield reader.value()
+            elif isinstance(obj.get("pain_points"), list):
+                yield from obj["pain_points"]
+            else:
+                yield obj
+            return
+
+        # Multi-line (or huge) object: walk it key by key, streaming "pain_points" in place
+        reader.expect("{")
+        head = {}
+        while reader.peek() != "}":
+            key = reader.value()
+            reader.expect(":")
+            if key == "pain_points" and reader.peek() == "[":
+                yield from reader.array_items()
+                return
+            head[key] = reader.value()
+            if reader.peek() == ",":
+                reader.pos += 1
+        reader.pos += 1
+
+        # No "pain_points" key: the object is itself a record (possibly followed by more)
+        yield head
+        while reader.peek():
+            yield reader.value()
+
+
+def record_text(record) -> str:
+    """Flattens a record (string or scraped dict) into one line of text."""
+    if isinstance(record, str):
+        return record.strip()
+    if isinstance(record, dict):
+        parts = [str(record[k]).strip() for k in ("title", "text", "body") if record.get(k)]
+        if parts:
+            return " - ".join(parts)
+    return json.dumps(record, ensure_ascii=False)
+
+
+def iter_pain_points(
+    path: str,
+    keyword: Optional[str] = None,
+    min_length: int = 1,
+    max_items: Optional[int] = None,
+    max_chars: Optional[int] = None,
+) -> Iterator[str]:
+    """
+    Streams pain-point texts, applying filters and a size budget on the fly.
+    Stops reading the file as soon as max_items or max_chars is reached.
+    """
+    keyword = keyword.lower() if keyword else None
+    count = 0
+    used = 0
+
+    for record in iter_records(path):
+        text = " ".join(record_text(record).split())
+        if len(text) < min_length:
+            continue
+        if keyword and keyword not in text.lower():
+            continue
+        if max_chars is not None and used + len(text) > max_chars:
+            # The rest of the file is never read, so it can't be counted here
+            print(f"⚠️ [PainPoints] Size budget reached ({used:,}/{max_chars:,} chars): kept {count} pain point(s), "
+                  f"skipped the remaining records of {os.path.basename(path)}")
+            break
+
+        yield text
+        count += 1
+        used += len(text)
+        if max_items is not None and count >= max_items:
+            break
+
+
+def load_pain_points(path: str, **filters) -> list:
+    """iter_pain_points() materialized; memory is bounded by the filters' budget."""
+    return list(iter_pain_points(path, **filters))
+
+
+# ─────────────────────────────────────────────
+# Benchmark: legacy json.load + concat vs streaming loader
+# ─────────────────────────────────────────────
+
+def _measure(mode: str, path: str, max_chars: Optional[int]) -> dict:
+    import time
+    import resource
+
+    start = time.perf_counter()
+    if mode == "legacy":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        points = data if isinstance(data, list) else data.get("pain_points", [])
+        source = "# idea\n"
+        for i, point in enumerate(points, 1):
+            source += f"{i}. {point}\n"
+        items = len(points)
+    else:
+        # Same shape as format_idea_as_source(): one pass over the generator, one join
+        lines = [f"{i}. {point}\n" for i, point in enumerate(iter_pain_points(path, max_chars=max_chars), 1)]
+        items = len(lines)
+        source = "".join(["# idea\n"] + lines)
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / (1 << 20) if sys.platform == "darwin" else rss / 1024
+    return {"mode": mode, "max_chars": max_chars, "items": items, "source_chars": len(source),
+            "load_sec": round(elapsed, 3), "peak_rss_mb": round(rss_mb, 1)}
+
+
+def benchmark(records: int = 1_000_000, max_chars: Optional[int] = 200_000) -> list:
+    """
+    Writes a synthetic scrape dump and measures each loader in a fresh process:
+    legacy and streaming over the whole file (no budget), then streaming with
+    the size budget as a separate row.
+    """
+    import tempfile
+    import subprocess
+
+    fd, path = tempfile.mkstemp(suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write("[")
+            for i in range(records):
+                if i:
+                    f.write(",")
+                json.dump({"title": f"Post {i}", "text": f"Pain point number {i} " * 8}, f)
+            f.write("]")
+
+        runs = [("legacy", 0), ("stream", 0)]
+        if max_chars:
+            runs.append(("stream", max_chars))
+
+        results = []
+        for mode, budget in runs:
+            out = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--measure", mode, path, "--max-chars", str(budget)],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            result = json.loads(out.strip().splitlines()[-1])
+            result["file_mb"] = round(os.path.getsize(path) / (1 << 20), 1)
+            results.append(result)
+        return results
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pain-point loader benchmark")
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--max-chars", type=int, default=200_000, help="budget for the extra budgeted run (0 = skip)")
+    parser.add_argument("--measure", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(_measure(args.measure[0], args.measure[1], args.max_chars or None)))
+    else:
+        for row in benchmark(args.records, args.max_chars or None):
+            print(json.dumps(row))
@@ -0,0 +1,163 @@
+import os
+import time
+import fcntl
+import shutil
+from pathlib import Path
+
+# Default location for managed Chromium profiles (one directory per worker slot)
+DEFAULT_PROFILE_ROOT = Path.home() / ".cloud-shield" / "profiles"
+
+# Cache directories inside a Chromium profile that are safe to delete.
+# Cookies / Local Storage live elsewhere and are never touched by pruning.
+CACHE_DIRS = [
+    "Default/Cache",
+    "Default/Code Cache",
+    "Default/GPUCache",
+    "Default/Service Worker/CacheStorage",
+    "ShaderCache",
+    "GrShaderCache",
+]
+
+
+def dir_size(path: Path) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class ProfileManager:
+    """
+    Manages persistent Chromium profile directories so the HTTP cache and
+    V8 code cache survive between jobs (NotebookLM / Reddit bundles are not
+    re-downloaded and re-compiled on every run).
+
+    - One directory per worker slot; an flock on the slot's lock file
+      prevents two live browsers from sharing a profile (Chromium refuses
+      that anyway). The lock is held for as long as the slot is acquired.
+    - Each profile is capped at max_bytes; when over the cap (checked at most
+      every prune_interval seconds) the cache directories are cleared.
+    """
+
+    def __init__(self, root: str = None, max_bytes: int = 500 * 1024 * 1024, prune_interval: float = 3600):
+        self.root = Path(root) if root else DEFAULT_PROFILE_ROOT
+        self.max_bytes = max_bytes
+        self.prune_interval = prune_interval
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._locks = {}  # slot -> fd holding the flock for the life of the browser
+
+    def profile_dir(self, slot: int = 0) -> Path:
+        return self.root / f"slot-{slot}"
+
+    def launch_args(self) -> list:
+        """Extra Chromium args that keep the disk cache inside the size cap."""
+        return [f"--disk-cache-size={self.max_bytes // 2}"]
+
+    def acquire(self, slot: int = 0) -> Path:
+        """Locks the slot's profile, prunes it if due, and returns its path."""
+        path = self.profile_dir(slot)
+        path.mkdir(parents=True, exist_ok=True)
+        if slot in self._locks:
+            raise RuntimeError(f"Profile slot {slot} is already held by this manager")
+
+        # The kernel drops a flock when its holder exits, so a crashed worker
+        # never leaves a stale lock behind (no pid bookkeeping needed).
+        fd = os.open(path / ".slot.lock", os.O_CREAT | os.O_RDWR, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            raise RuntimeError(f"Profile slot {slot} is in use by another browser")
+        self._locks[slot] = fd
+
+        self.maybe_prune(slot)
+        return path
+
+    def release(self, slot: int = 0):
+        fd = self._locks.pop(slot, None)
+        if fd is None:
+            return
+        # Unlock only; deleting the file would let a waiter lock an unlinked inode
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+    def maybe_prune(self, slot: int = 0) -> bool:
+        path = self.profile_dir(slot)
+        stamp = path / ".last_prune"
+        if stamp.exists() and time.time() - stamp.stat().st_mtime < self.prune_interval:
+            return False
+        stamp.touch()
+        return self.prune(slot)
+
+    def prune(self, slot: int = 0) -> bool:
+        """Clears cache directories if the profile exceeds max_bytes."""
+        path = self.profile_dir(slot)
+        size = dir_size(path)
+        if size <= self.max_bytes:
+            return False
+
+        print(f"🧹 [Profile] slot-{slot} is {size / 1e6:.0f} MB (cap {self.max_bytes / 1e6:.0f} MB). Pruning caches...")
+        for rel in CACHE_DIRS:
+            shutil.rmtree(path / rel, ignore_errors=True)
+        return True
+
+
+def measure_first_navigation(url: str, runs: int = 3, headless: bool = True, root: str = None) -> dict:
+    """
+    Cold vs warm first-navigation timing.
+    cold: fresh throwaway profile every run.
+    warm: the same managed profile reused across runs (first run primes it).
+    """
+    import tempfile
+    from playwright.sync_api import sync_playwright
+
+    manager = ProfileManager(root=root or tempfile.mkdtemp(prefix="cs-profiles-"))
+
+    def first_goto(user_data_dir: str) -> float:
+        with sync_playwright() as p:
+            context = p.chromium.launch_persistent_context(user_data_dir, headless=headless, args=manager.launch_args())
+            page = context.pages[0] if context.pages else context.new_page()
+            start = time.perf_counter()
+            page.goto(url, wait_until="load", timeout=60000)
+            elapsed = time.perf_counter() - start
+            context.close()
+            return elapsed
+
+    cold = []
+    for _ in range(runs):
+        tmp = tempfile.mkdtemp(prefix="cs-cold-")
+        try:
+            cold.append(first_goto(tmp))
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    path = manager.acquire(0)
+    try:
+        first_goto(str(path))  # prime
+        warm = [first_goto(str(path)) for _ in range(runs)]
+    finally:
+        manager.release(0)
+
+    return {
+        "url": url,
+        "cold_ms": [round(t * 1000) for t in cold],
+        "warm_ms": [round(t * 1000) for t in warm],
+        "cold_avg_ms": round(sum(cold) / len(cold) * 1000),
+        "warm_avg_ms": round(sum(warm) / len(warm) * 1000),
+    }
+
+
+if __name__ == "__main__":
+    import json
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Cold vs warm profile first-navigation benchmark")
+    parser.add_argument("--url", default="https://notebooklm.google.com/")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(json.dumps(measure_first_navigation(args.url, args.runs), indent=2))
@@ -8,15 +8,35 @@ from playwright.sync_api import sync_playwright, Page, Locator
 # Import Healer relatively
 try:
     from .healer import Healer
+    from .profile_manager import ProfileManager
+    from .network_cache import NetworkCache
+    from .deadline import Deadline, DeadlineExceeded
+    from .browser_metrics import BrowserMetrics
 except ImportError:
     # Fallback/Direct execution support
     import sys
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
     from healer import Healer
+    from profile_manager import ProfileManager
+    from network_cache import NetworkCache
+    from deadline import Deadline, DeadlineExceeded
+    from browser_metrics import BrowserMetrics
 
 class StealthDriver:
-    def __init__(self, headless=True):
+    def __init__(self, headless=True, profile_slot: int = None, profile_manager: ProfileManager = None,
+                 network_cache: NetworkCache = None, deadline: Deadline = None, metrics_interval: float = None):
         self.headless = headless
+        # profile_slot set -> run on a managed persistent profile (warm HTTP/JS cache)
+        self.profile_slot = profile_slot
+        self.profile_manager = (profile_manager or ProfileManager()) if profile_slot is not None else None
+        self._profile_acquired = False
+        # network_cache set -> record responses to / replay them from a local archive
+        self.network_cache = network_cache
+        # Job-wide time budget; every wait is capped at what is left (unlimited by default)
+        self.deadline = deadline or Deadline()
+        # metrics_interval set -> sample JS heap / DOM / CPU / network counters (0 = on demand only)
+        self.metrics_interval = metrics_interval
+        self.metrics = None
         self.playwright = None
         self.browser = None
         self.context = None
@@ -43,24 +63,41 @@ class StealthDriver:
         self.playwright = sync_playwright().start()
         # Launch options for stealth
         print(f"🚀 [Stealth] Launching Browser (Headless: {self.headless})...")
-        self.browser = self.playwright.chromium.launch(
-            headless=self.headless,
-            args=[
-                "--disable-blink-features=AutomationControlled",
-                "--no-sandbox",
-                "--disable-infobars"
-            ]
-        )
-        
+        args = [
+            "--disable-blink-features=AutomationControlled",
+            "--no-sandbox",
+            "--disable-infobars"
+        ]
         # Consistent Context with spoofed user agent and locale
-        self.context = self.browser.new_context(
+        context_options = dict(
             user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
             viewport={"width": 1920, "height": 1080},
             locale="en-US",
             timezone_id="America/New_York"
         )
         
-        self.page = self.context.new_page()
+        if self.profile_manager:
+            profile_dir = self.profile_manager.acquire(self.profile_slot)
+            self._profile_acquired = True
+            print(f"💾 [Stealth] Using persistent profile: {profile_dir}")
+            self.context = self.playwright.chromium.launch_persistent_context(
+                str(profile_dir),
+                headless=self.headless,
+                args=args + self.profile_manager.launch_args(),
+                **context_options
+            )
+        else:
+            self.browser = self.playwright.chromium.launch(headless=self.headless, args=args)
+            self.context = self.browser.new_context(**context_options)
+        
+        if self.network_cache and self.network_cache.enabled:
+            self.network_cache.attach(self.context)
+        
+        self.page = self.context.pages[0] if self.context.pages else self.context.new_page()
+        
+        if self.metrics_interval is not None:
+            self.metrics = BrowserMetrics(self.page, interval=self.metrics_interval)
+            self.metrics.sample("start")
         
         # Evasion Scripts
         # Mask webdriver property
@@ -69,23 +106,43 @@ class StealthDriver:
         return self.page
 
     def stop(self):
+        if self.metrics:
+            self.metrics.sample("stop")
+            self.metrics.close()
         if self.context:
             self.context.close()
+            # The HAR is written on close; scrub it before anything else reads it
+            if self.network_cache and self.network_cache.enabled:
+                self.network_cache.finalize()
         if self.browser:
             self.browser.close()
         if self.playwright:
             self.playwright.stop()
+        # Only release a slot we actually locked; acquire() may have failed on a busy slot
+        if self._profile_acquired:
+            self.profile_manager.release(self.profile_slot)
+            self._profile_acquired = False
         print("🛑 [Stealth] Browser Stopped.")
 
+    def tick_metrics(self):
+        """Samples resources while waiting (only once per metrics interval)."""
+        if self.metrics:
+            self.metrics.tick()
+
     def random_delay(self, min_sec=1, max_sec=3):
         sleep_time = random.uniform(min_sec, max_sec)
-        time.sleep(sleep_time)
+        self.tick_metrics()
+        self.deadline.sleep(sleep_time)
+        self.tick_metrics()
 
-    def safe_locate(self, platform: str, target_key: str, timeout: int = 5000) -> Locator:
+    def safe_locate(self, platform: str, target_key: str, timeout: int = 5000, deadline: Deadline = None) -> Locator:
         """
         Locates an element using the config selector.
         If not found, calls Healer to find a new selector and retries.
+        Every wait (and the Healer call) is capped at the deadline's remaining
+        budget; raises DeadlineExceeded once it runs out.
         """
+        deadline = deadline or self.deadline
         # Reload selectors in case Healer updated them recently
         self.selectors = self._load_selectors()
         
@@ -95,33 +152,41 @@ class StealthDriver:
             
         selector = self.selectors[platform][target_key]
 
+        first_timeout = deadline.timeout_ms(timeout)
         try:
             # 1st attempt
             element = self.page.locator(selector).first
-            element.wait_for(timeout=timeout, state="attached") 
+            element.wait_for(timeout=first_timeout, state="attached") 
             return element
             
         except Exception:
             print(f"🚨 [Stealth] '{target_key}' on {platform} not found via '{selector}'. Initiating Healer...")
+            self.tick_metrics()
             
             # Healer call
+            deadline.check()
             try:
                 html = self.page.content()
-                new_selector = self.healer.fix_selector(html, target_key, platform)
+                new_selector = self.healer.fix_selector(html, target_key, platform, page=self.page, deadline=deadline)
                 
                 if new_selector:
                     print(f"🔄 [Stealth] Retrying with new selector: {new_selector}")
                     # Retry with new selector
                     element = self.page.locator(new_selector).first
+                    retry_timeout = deadline.timeout_ms(timeout)
                     try:
-                        element.wait_for(timeout=timeout, state="attached")
+                        element.wait_for(timeout=retry_timeout, state="attached")
                         return element
                     except:
+                        self.tick_metrics()
+                        deadline.check()
                         print(f"❌ [Stealth] New selector also failed.")
                         return None
                 else:
                     print(f"❌ [Stealth] Healing failed (No selector returned).")
                     return None
+            except DeadlineExceeded:
+                raise
             except Exception as e:
                 print(f"❌ [Stealth] Critical Error during healing process: {e}")
                 return None
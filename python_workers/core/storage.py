@@ -0,0 +1,359 @@
+import os
+import json
+import time
+import queue
+import hashlib
+import sqlite3
+import threading
+from typing import Optional
+
+# Table layouts shared by every backend.
+# The first column is the idempotency key used for ON CONFLICT upserts.
+TABLES = {
+    "pain_points": ["id", "platform", "source_url", "text", "created_at"],
+    "plans": ["id", "title", "idea", "notebook_url", "plan_file", "content", "created_at"],
+}
+
+# Set on first insert only; a re-save of the same row must not rewrite them
+INSERT_ONLY = {"created_at"}
+
+
+def _update_columns(table: str) -> list:
+    return [c for c in TABLES[table][1:] if c not in INSERT_ONLY]
+
+
+def make_id(*parts) -> str:
+    """Stable content hash so re-saving the same row is a no-op upsert."""
+    h = hashlib.sha1()
+    for part in parts:
+        h.update(str(part or "").encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+class SQLiteBackend:
+    """
+    Local stand-in for Supabase/Postgres (tests, offline runs, benchmarks).
+    Keeps a small pool of connections; each batch is one transaction.
+    """
+
+    def __init__(self, path: str = ":memory:", pool_size: int = 2):
+        self.path = path
+        # A shared-cache URI lets pooled connections see the same in-memory DB
+        if path == ":memory:":
+            self._dsn, self._uri = f"file:cloudshield_{id(self)}?mode=memory&cache=shared", True
+        else:
+            self._dsn, self._uri = path, False
+        self._pool = queue.LifoQueue()
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+        self._create_tables()
+
+    def _connect(self):
+        conn = sqlite3.connect(self._dsn, uri=self._uri, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _create_tables(self):
+        conn = self._pool.get()
+        try:
+            for table, cols in TABLES.items():
+                defs = ", ".join(f"{c} TEXT PRIMARY KEY" if i == 0 else f"{c} TEXT" for i, c in enumerate(cols))
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({defs})")
+            conn.commit()
+        finally:
+            self._pool.put(conn)
+
+    def upsert(self, table: str, rows: list):
+        cols = TABLES[table]
+        placeholders = ", ".join("?" for _ in cols)
+        updates = ", ".join(f"{c}=excluded.{c}" for c in _update_columns(table))
+        sql = (
+            f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({placeholders}) "
+            f"ON CONFLICT({cols[0]}) DO UPDATE SET {updates}"
+        )
+        conn = self._pool.get()
+        try:
+            with conn:
+                conn.executemany(sql, [tuple(r.get(c) for c in cols) for r in rows])
+        finally:
+            self._pool.put(conn)
+
+    def count(self, table: str) -> int:
+        conn = self._pool.get()
+        try:
+            return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        finally:
+            self._pool.put(conn)
+
+    def close(self):
+        while not self._pool.empty():
+            self._pool.get().close()
+
+
+class PostgresBackend:
+    """Direct Postgres (e.g. Supabase's pooler port) via a psycopg2 connection pool."""
+
+    def __init__(self, dsn: str, pool_size: int = 4):
+        from psycopg2.pool import ThreadedConnectionPool
+        from psycopg2.extras import execute_values
+
+        self._execute_values = execute_values
+        self._pool = ThreadedConnectionPool(1, pool_size, dsn)
+        self._create_tables()
+
+    def _create_tables(self):
+        conn = self._pool.getconn()
+        try:
+            with conn, conn.cursor() as cur:
+                for table, cols in TABLES.items():
+                    defs = ", ".join(f"{c} TEXT PRIMARY KEY" if i == 0 else f"{c} TEXT" for i, c in enumerate(cols))
+                    cur.execute(f"CREATE TABLE IF NOT EXISTS {table} ({defs})")
+        finally:
+            self._pool.putconn(conn)
+
+    def upsert(self, table: str, rows: list):
+        cols = TABLES[table]
+        updates = ", ".join(f"{c}=EXCLUDED.{c}" for c in _update_columns(table))
+        sql = (
+            f"INSERT INTO {table} ({', '.join(cols)}) VALUES %s "
+            f"ON CONFLICT ({cols[0]}) DO UPDATE SET {updates}"
+        )
+        conn = self._pool.getconn()
+        try:
+            with conn, conn.cursor() as cur:
+                self._execute_values(cur, sql, [tuple(r.get(c) for c in cols) for r in rows], page_size=len(rows))
+        finally:
+            self._pool.putconn(conn)
+
+    def count(self, table: str) -> int:
+        conn = self._pool.getconn()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(f"SELECT COUNT(*) FROM {table}")
+                return cur.fetchone()[0]
+        finally:
+            self._pool.putconn(conn)
+
+    def close(self):
+        self._pool.closeall()
+
+
+class SupabaseBackend:
+    """
+    Supabase REST (PostgREST) backend. The client keeps one HTTP session,
+    so every batch reuses the same keep-alive connection.
+    Tables must already exist in the project (see TABLES for the columns),
+    with created_at defaulting to now(): PostgREST upserts overwrite every
+    column they are sent, so insert-only columns are left to the database.
+    """
+
+    def __init__(self, url: str = None, key: str = None):
+        from supabase import create_client
+
+        url = url or os.getenv("SUPABASE_URL") or os.getenv("NEXT_PUBLIC_SUPABASE_URL")
+        key = key or os.getenv("SUPABASE_KEY") or os.getenv("NEXT_PUBLIC_SUPABASE_ANON_KEY")
+        if not url or not key:
+            raise ValueError("SUPABASE_URL / SUPABASE_KEY not set.")
+        self.client = create_client(url, key)
+
+    def upsert(self, table: str, rows: list):
+        rows = [{k: v for k, v in r.items() if k not in INSERT_ONLY} for r in rows]
+        self.client.table(table).upsert(rows, on_conflict=TABLES[table][0]).execute()
+
+    def count(self, table: str) -> int:
+        res = self.client.table(table).select("id", count="exact").limit(1).execute()
+        return res.count or 0
+
+    def close(self):
+        pass
+
+
+def open_backend(url: str):
+    """
+    sqlite:///path/to.db | sqlite:// (in-memory) | postgresql://... | supabase
+    """
+    if url == "supabase":
+        return SupabaseBackend()
+    if url.startswith("sqlite://"):
+        return SQLiteBackend(url[len("sqlite:///"):] or ":memory:")
+    if url.startswith(("postgres://", "postgresql://")):
+        return PostgresBackend(url)
+    raise ValueError(f"Unknown storage URL: {url}")
+
+
+class Store:
+    """
+    Persistence layer for scraped pain points and generated plans.
+
+    Producers call save_*() which only enqueue rows; a single background
+    writer drains the bounded queue and upserts in batches. When the queue
+    is full, save_*() blocks (backpressure) instead of growing memory.
+    """
+
+    _STOP = object()
+
+    def __init__(self, backend, batch_size: int = 500, flush_interval: float = 0.5, max_queue: int = 10000,
+                 max_retries: int = 3, retry_backoff: float = 0.5):
+        self.backend = backend
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._error: Optional[Exception] = None
+        self.stats = {"rows": 0, "batches": 0, "retries": 0, "failed_rows": 0, "write_sec": 0.0}
+
+        self._writer = threading.Thread(target=self._run, name="store-writer", daemon=True)
+        self._writer.start()
+
+    # ---- producer side ----
+
+    def save_pain_point(self, text, platform: str = "reddit", source_url: str = None):
+        if not isinstance(text, str):
+            # Scrape dumps may hold dict records; store them as JSON text
+            text = json.dumps(text, ensure_ascii=False)
+        self._put("pain_points", {
+            "id": make_id(platform, source_url, text),
+            "platform": platform,
+            "source_url": source_url,
+            "text": text,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        })
+
+    def save_pain_points(self, texts, platform: str = "reddit", source_url: str = None):
+        for text in texts:
+            self.save_pain_point(text, platform, source_url)
+
+    def save_plan(self, title: str, content: str, idea: str = None, notebook_url: str = None, plan_file: str = None):
+        self._put("plans", {
+            "id": make_id(title, idea, content),
+            "title": title,
+            "idea": idea,
+            "notebook_url": notebook_url,
+            "plan_file": plan_file,
+            "content": content,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        })
+
+    def _put(self, table: str, row: dict):
+        self._queue.put((table, row))
+
+    def _raise_if_failed(self):
+        """Reports batches dropped since the last check; later batches are unaffected."""
+        error, self._error = self._error, None
+        if error:
+            raise RuntimeError(f"Store writer dropped {self.stats['failed_rows']} row(s) so far; last error: {error}")
+
+    def flush(self):
+        """Blocks until everything enqueued so far has been written (or given up on)."""
+        self._queue.join()
+        self._raise_if_failed()
+
+    def close(self):
+        self._queue.put(self._STOP)
+        self._writer.join()
+        self.backend.close()
+        self._raise_if_failed()
+
+    # ---- writer side ----
+
+    def _run(self):
+        pending = {}  # table -> {id: row}; dedups repeated rows within a batch
+        count = 0
+        deadline = time.monotonic() + self.flush_interval
+        stop = False
+
+        while not stop:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+
+            if item is self._STOP:
+                stop = True
+                self._queue.task_done()
+            elif item is not None:
+                table, row = item
+                pending.setdefault(table, {})[row["id"]] = row
+                count += 1
+
+            if count and (stop or count >= self.batch_size or time.monotonic() >= deadline):
+                self._write(pending)
+                for _ in range(count):
+                    self._queue.task_done()
+                pending, count = {}, 0
+            if time.monotonic() >= deadline:
+                deadline = time.monotonic() + self.flush_interval
+
+    def _write(self, pending: dict):
+        start = time.perf_counter()
+        for table, rows in pending.items():
+            self._write_batch(table, list(rows.values()))
+        self.stats["write_sec"] += time.perf_counter() - start
+
+    def _write_batch(self, table: str, rows: list):
+        """Upserts one batch, retrying with bounded exponential backoff (upserts are idempotent)."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.backend.upsert(table, rows)
+                self.stats["rows"] += len(rows)
+                self.stats["batches"] += 1
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    # Give up on this batch but keep draining so producers never deadlock;
+                    # the failure is reported by the next flush()/close()
+                    print(f"❌ [Store] Batch write to {table} failed after {attempt + 1} attempts, dropping {len(rows)} row(s): {e}")
+                    self.stats["failed_rows"] += len(rows)
+                    self._error = e
+                    return
+                delay = min(self.retry_backoff * (2 ** attempt), 10.0)
+                print(f"⚠️ [Store] Batch write to {table} failed ({e}); retrying in {delay:.1f}s...")
+                self.stats["retries"] += 1
+                time.sleep(delay)
+
+
+def benchmark(rows: int = 100_000, url: str = "sqlite://", batch_size: int = 500):
+    """Ingest `rows` synthetic pain points and report end-to-end throughput."""
+    backend = open_backend(url)
+    store = Store(backend, batch_size=batch_size)
+
+    start = time.perf_counter()
+    for i in range(rows):
+        store.save_pain_point(f"pain point #{i}", source_url=f"https://reddit.com/r/SaaS/{i}")
+    enqueue_sec = time.perf_counter() - start
+    store.flush()
+    total_sec = time.perf_counter() - start
+    stored = backend.count("pain_points")
+    batches = store.stats["batches"]
+
+    # Second pass: same rows again must not create duplicates
+    for i in range(rows):
+        store.save_pain_point(f"pain point #{i}", source_url=f"https://reddit.com/r/SaaS/{i}")
+    store.flush()
+    assert backend.count("pain_points") == stored, "upsert is not idempotent"
+
+    store.close()
+    return {
+        "rows": rows,
+        "stored": stored,
+        "batch_size": batch_size,
+        "enqueue_sec": round(enqueue_sec, 3),
+        "total_sec": round(total_sec, 3),
+        "rows_per_sec": round(rows / total_sec),
+        "batches": batches,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Storage ingest benchmark")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--url", default="sqlite://", help="sqlite:///file.db, postgresql://..., supabase")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    print(json.dumps(benchmark(args.rows, args.url, args.batch_size), indent=2))
@@ -7,10 +7,14 @@ import argparse
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from core.stealth_driver import StealthDriver
+from core.network_cache import NetworkCache
+from core.deadline import Deadline
+from core.browser_metrics import export_job
 
 class MarketingBot:
-    def __init__(self, headless=True):
-        self.driver = StealthDriver(headless=headless)
+    def __init__(self, headless=True, profile_slot=None, network_cache=None, deadline=None, metrics_interval=None):
+        self.driver = StealthDriver(headless=headless, profile_slot=profile_slot, network_cache=network_cache,
+                                    deadline=deadline, metrics_interval=metrics_interval)
         self.page = None
 
     def start(self):
@@ -21,6 +25,10 @@ class MarketingBot:
     def stop(self):
         """Stops the bot"""
         self.driver.stop()
+        if self.driver.metrics:
+            summary = self.driver.metrics.summary()
+            print(f"📈 Browser metrics: {summary}")
+            export_job(summary, job="marketing_bot")
         print("👋 Marketing Bot Stopped.")
 
     def run_demo_mission(self):
@@ -34,8 +42,10 @@ class MarketingBot:
             self.start()
             
             print("🔍 Navigating to Reddit...")
-            self.page.goto("https://www.reddit.com/r/SaaS/")
+            self.page.goto("https://www.reddit.com/r/SaaS/", timeout=self.driver.deadline.timeout_ms(30000))
             self.driver.random_delay(2, 4)
+            if self.driver.metrics:
+                self.driver.metrics.sample("reddit_loaded")
             
             # Example interaction using safe_locate (Healer integration)
             # Note: We need to define keys in selectors.json first if not present
@@ -52,7 +62,8 @@ class MarketingBot:
             title_selector = self.driver.selectors.get("reddit", {}).get("post_title", "h3")
             
             # Wait for content
-            self.page.wait_for_selector(title_selector, timeout=10000)
+            self.page.wait_for_selector(title_selector, timeout=self.driver.deadline.timeout_ms(10000))
+            self.driver.tick_metrics()
             
             titles = self.page.locator(title_selector).all_inner_texts()
             
@@ -71,9 +82,20 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Stealth Phoenix Marketing Bot")
     parser.add_argument("--headless", action="store_true", help="Run in headless mode")
     parser.add_argument("--no-headless", action="store_false", dest="headless", help="Run in visual mode")
+    parser.add_argument("--profile-slot", type=int, help="Reuse a persistent browser profile (warm cache) for this worker slot")
+    parser.add_argument("--net-mode", choices=["off", "record", "replay"], default="off", help="Record network to / replay it from a local archive")
+    parser.add_argument("--net-archive", help="HAR archive path (default: ~/.cloud-shield/network/default.har.zip)")
+    parser.add_argument("--net-offline", action="store_true", help="In replay mode, abort URLs missing from the archive instead of passing them through")
+    parser.add_argument("--deadline", type=float, help="End-to-end time budget in seconds; fail fast once it runs out")
+    parser.add_argument("--metrics-interval", type=float, help="Sample browser resource metrics every N seconds (0 = step boundaries only)")
     parser.set_defaults(headless=True)
     
     args = parser.parse_args()
     
-    bot = MarketingBot(headless=args.headless)
-    bot.run_demo_mission()
\ No newline at end of file
+    network_cache = NetworkCache(args.net_mode, args.net_archive, passthrough=not args.net_offline)
+    bot = MarketingBot(headless=args.headless, profile_slot=args.profile_slot, network_cache=network_cache,
+                       deadline=Deadline(args.deadline), metrics_interval=args.metrics_interval)
+    
+    start = time.perf_counter()
+    bot.run_demo_mission()
+    print(f"⏱️ Mission took {time.perf_counter() - start:.2f}s (network: {args.net_mode})")
\ No newline at end of file
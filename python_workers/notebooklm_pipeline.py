@@ -11,6 +11,7 @@ import sys
 import json
 import time
 import argparse
+import contextlib
 from pathlib import Path
 
 # Playwright 기반 NotebookLM 자동화
@@ -20,6 +21,13 @@ except ImportError:
     print("❌ playwright가 설치되지 않았습니다. 'pip install playwright' 후 'playwright install chromium'을 실행하세요.")
     sys.exit(1)
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from core.profile_manager import ProfileManager
+from core.pain_point_loader import iter_pain_points
+from core.network_cache import NetworkCache
+from core.deadline import Deadline, DeadlineExceeded
+from core.browser_metrics import BrowserMetrics, export_job
+
 
 # ─────────────────────────────────────────────
 # 설정
@@ -28,6 +36,31 @@ AUTH_JSON_PATH = Path.home() / ".notebooklm-mcp" / "auth.json"
 NOTEBOOKLM_URL = "https://notebooklm.google.com"
 OUTPUT_DIR = Path(__file__).parent.parent / "output" / "plans"
 
+# run_pipeline 단계 번호 → 이름 (이벤트/소요 시간 보고용)
+STEP_NAMES = {
+    0: "start_browser",
+    1: "format_source",
+    2: "create_notebook",
+    3: "add_source",
+    4: "generate_report",
+    5: "save",
+}
+
+# 파이프라인 최종 이벤트의 step 번호 (route.ts의 step 99와 동일)
+# status: "done" (url 포함) | "error" (error 포함). 소요 시간 집계에는 포함되지 않음
+FINAL_STEP = 99
+
+# 기획서 생성 요청 프롬프트 (화면에 다시 보이는 사용자 메시지를 응답과 구분하는 데도 사용)
+REPORT_PROMPT = "위 아이디어를 바탕으로 상세한 PRD(Product Requirements Document) 기획서를 한국어로 작성해주세요. 제품 개요, 타겟 사용자, 핵심 기능, 기술 스택, 수익 모델, 개발 로드맵을 포함해주세요."
+
+# 채팅 응답 노드 후보 (가장 마지막 노드가 최신 응답)
+RESPONSE_SELECTORS = [
+    ".response-text",
+    ".chat-response",
+    "[data-testid='response']",
+    ".message-content",
+]
+
 
 def load_cookies() -> list:
     """~/.notebooklm-mcp/auth.json 에서 쿠키를 로드합니다.
@@ -79,21 +112,43 @@ def load_cookies() -> list:
     raise ValueError(f"❌ 알 수 없는 auth.json 형식: {type(raw_cookies)}")
 
 
-def format_idea_as_source(idea: str, pain_points: list = None) -> str:
-    """아이디어와 페인포인트를 NotebookLM 소스 텍스트로 포맷합니다."""
-    content = f"""# 사업 아이디어 기획 요청
+def make_jsonl_emitter(stream=None):
+    """{step, status, delta} 이벤트를 한 줄짜리 JSON으로 출력하는 콜백을 만듭니다.
+    
+    app/api/apb/generate/route.ts 같은 호출자가 stdout을 줄 단위로 읽어
+    그대로 중계할 수 있도록 매 이벤트마다 flush 합니다.
+    delta에는 생성된 기획서 텍스트만 담고, 오류 메시지 등은 추가 필드(error=...)로 보냅니다.
+    """
+    stream = stream or sys.stdout
+
+    def emit(step: int, status: str, delta: str = "", **extra):
+        event = {"step": step, "status": status, "delta": delta}
+        event.update(extra)
+        stream.write(json.dumps(event, ensure_ascii=False) + "\n")
+        stream.flush()
+
+    return emit
+
+
+def format_idea_as_source(idea: str, pain_points=None) -> str:
+    """아이디어와 페인포인트를 NotebookLM 소스 텍스트로 포맷합니다.
+    
+    pain_points는 리스트뿐 아니라 iter_pain_points() 같은 제너레이터도 받으며,
+    한 번만 순회하면서 조각을 모아 마지막에 한 번에 합칩니다.
+    """
+    parts = [f"""# 사업 아이디어 기획 요청
 
 ## 핵심 아이디어
 {idea}
 
-"""
-    if pain_points:
-        content += "## 수집된 사용자 불편사항 (Reddit 스크래핑)\n"
-        for i, point in enumerate(pain_points, 1):
-            content += f"{i}. {point}\n"
-        content += "\n"
+"""]
+    points = [f"{i}. {point}\n" for i, point in enumerate(pain_points or (), 1)]
+    if points:
+        parts.append("## 수집된 사용자 불편사항 (Reddit 스크래핑)\n")
+        parts.extend(points)
+        parts.append("\n")
 
-    content += """## 기획서 작성 요청사항
+    parts.append("""## 기획서 작성 요청사항
 
 아래 항목들을 포함한 상세 PRD(Product Requirements Document)를 작성해주세요:
 
@@ -107,13 +162,25 @@ def format_idea_as_source(idea: str, pain_points: list = None) -> str:
 8. **성공 지표** - KPI 및 목표 수치
 9. **리스크 분석** - 주요 리스크 및 대응 방안
 10. **마케팅 전략** - 초기 사용자 확보 전략
-"""
-    return content
+""")
+    return "".join(parts)
 
 
 class NotebookLMPipeline:
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, profile_slot: int = None, profile_manager: ProfileManager = None,
+                 network_cache: NetworkCache = None, deadline: Deadline = None, metrics_interval: float = None):
         self.headless = headless
+        # profile_slot 지정 시 워커 슬롯별 영구 프로필 사용 (HTTP/JS 캐시 재사용)
+        self.profile_slot = profile_slot
+        self.profile_manager = (profile_manager or ProfileManager()) if profile_slot is not None else None
+        self._profile_acquired = False
+        # network_cache 지정 시 네트워크 응답을 기록(record)하거나 로컬 아카이브에서 재생(replay)
+        self.network_cache = network_cache
+        # 작업 전체 시간 예산 - 모든 대기는 남은 예산 이내로 제한 (기본: 무제한)
+        self.deadline = deadline or Deadline()
+        # metrics_interval 지정 시 JS 힙 / DOM 노드 / CPU / 네트워크 사용량 수집 (0 = 단계 경계에서만)
+        self.metrics_interval = metrics_interval
+        self.metrics = None
         self.playwright = None
         self.browser = None
         self.context = None
@@ -124,17 +191,30 @@ class NotebookLMPipeline:
         cookies = load_cookies()
         
         self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(
-            headless=self.headless,
-            args=["--disable-blink-features=AutomationControlled", "--no-sandbox"]
-        )
-        
-        self.context = self.browser.new_context(
+        args = ["--disable-blink-features=AutomationControlled", "--no-sandbox"]
+        context_options = dict(
             user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
             viewport={"width": 1920, "height": 1080},
             locale="ko-KR"
         )
         
+        if self.profile_manager:
+            profile_dir = self.profile_manager.acquire(self.profile_slot)
+            self._profile_acquired = True
+            print(f"💾 영구 프로필 사용: {profile_dir}")
+            self.context = self.playwright.chromium.launch_persistent_context(
+                str(profile_dir),
+                headless=self.headless,
+                args=args + self.profile_manager.launch_args(),
+                **context_options
+            )
+        else:
+            self.browser = self.playwright.chromium.launch(headless=self.headless, args=args)
+            self.context = self.browser.new_context(**context_options)
+        
+        if self.network_cache and self.network_cache.enabled:
+            self.network_cache.attach(self.context)
+        
         # 쿠키 주입
         playwright_cookies = []
         for c in cookies:
@@ -151,25 +231,49 @@ class NotebookLMPipeline:
             playwright_cookies.append(cookie)
         
         self.context.add_cookies(playwright_cookies)
-        self.page = self.context.new_page()
+        self.page = self.context.pages[0] if self.context.pages else self.context.new_page()
+        
+        if self.metrics_interval is not None:
+            self.metrics = BrowserMetrics(self.page, interval=self.metrics_interval)
+            self.metrics.sample("start")
         print("🚀 브라우저 시작 완료")
 
     def stop(self):
         """브라우저 종료"""
+        if self.metrics:
+            self.metrics.close()
         if self.context:
             self.context.close()
+            # 기록 모드면 컨텍스트 종료 시 저장된 아카이브에서 쿠키를 제거
+            if self.network_cache and self.network_cache.enabled:
+                self.network_cache.finalize()
         if self.browser:
             self.browser.close()
         if self.playwright:
             self.playwright.stop()
+        # 실제로 잠근 슬롯만 해제 (사용 중인 슬롯이면 acquire()가 실패했을 수 있음)
+        if self._profile_acquired:
+            self.profile_manager.release(self.profile_slot)
+            self._profile_acquired = False
         print("🛑 브라우저 종료")
 
+    def tick_metrics(self):
+        """대기 중 리소스 샘플링 (metrics_interval이 지났을 때만 실제로 수집)"""
+        if self.metrics:
+            self.metrics.tick()
+
+    def wait(self, sec: float):
+        """데드라인 안에서 대기하고 리소스를 샘플링합니다. 모든 고정 대기는 이 함수를 거칩니다."""
+        self.tick_metrics()
+        self.deadline.sleep(sec)
+        self.tick_metrics()
+
     def create_notebook(self, title: str) -> str:
         """새 노트북을 생성하고 노트북 ID를 반환합니다."""
         print(f"📓 노트북 생성 중: {title}")
         
-        self.page.goto(NOTEBOOKLM_URL, wait_until="networkidle", timeout=30000)
-        time.sleep(3)
+        self.page.goto(NOTEBOOKLM_URL, wait_until="networkidle", timeout=self.deadline.timeout_ms(30000))
+        self.wait(3)  # goto 직후 샘플링도 여기서
         
         # 현재 URL 확인 (로그인 여부)
         current_url = self.page.url
@@ -189,10 +293,12 @@ class NotebookLMPipeline:
         
         clicked = False
         for selector in new_notebook_selectors:
+            self.tick_metrics()
+            timeout = self.deadline.timeout_ms(5000)
             try:
                 btn = self.page.locator(selector).first
-                btn.wait_for(timeout=5000, state="visible")
-                btn.click()
+                btn.wait_for(timeout=timeout, state="visible")
+                btn.click(timeout=self.deadline.timeout_ms(5000))
                 clicked = True
                 print(f"✅ '새 노트북' 버튼 클릭: {selector}")
                 break
@@ -203,11 +309,11 @@ class NotebookLMPipeline:
             # 스크린샷 저장 후 오류
             screenshot_path = OUTPUT_DIR / "debug_screenshot.png"
             OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-            self.page.screenshot(path=str(screenshot_path))
+            self.page.screenshot(path=str(screenshot_path), timeout=self.deadline.timeout_ms(10000))
             print(f"⚠️ 스크린샷 저장: {screenshot_path}")
             raise Exception("❌ '새 노트북' 버튼을 찾을 수 없습니다.")
         
-        time.sleep(2)
+        self.wait(2)
         
         # 노트북 URL에서 ID 추출
         notebook_url = self.page.url
@@ -229,16 +335,18 @@ class NotebookLMPipeline:
         ]
         
         for selector in add_source_selectors:
+            self.tick_metrics()
+            timeout = self.deadline.timeout_ms(5000)
             try:
                 btn = self.page.locator(selector).first
-                btn.wait_for(timeout=5000, state="visible")
-                btn.click()
+                btn.wait_for(timeout=timeout, state="visible")
+                btn.click(timeout=self.deadline.timeout_ms(5000))
                 print(f"✅ '소스 추가' 클릭: {selector}")
                 break
             except Exception:
                 continue
         
-        time.sleep(1)
+        self.wait(1)
         
         # "텍스트 붙여넣기" 옵션 선택
         paste_text_selectors = [
@@ -248,16 +356,18 @@ class NotebookLMPipeline:
         ]
         
         for selector in paste_text_selectors:
+            self.tick_metrics()
+            timeout = self.deadline.timeout_ms(5000)
             try:
                 btn = self.page.locator(selector).first
-                btn.wait_for(timeout=5000, state="visible")
-                btn.click()
+                btn.wait_for(timeout=timeout, state="visible")
+                btn.click(timeout=self.deadline.timeout_ms(5000))
                 print(f"✅ '텍스트 붙여넣기' 클릭")
                 break
             except Exception:
                 continue
         
-        time.sleep(1)
+        self.wait(1)
         
         # 텍스트 입력
         text_area_selectors = [
@@ -268,10 +378,12 @@ class NotebookLMPipeline:
         ]
         
         for selector in text_area_selectors:
+            self.tick_metrics()
+            timeout = self.deadline.timeout_ms(5000)
             try:
                 area = self.page.locator(selector).first
-                area.wait_for(timeout=5000, state="visible")
-                area.fill(content)
+                area.wait_for(timeout=timeout, state="visible")
+                area.fill(content, timeout=self.deadline.timeout_ms(10000))
                 print(f"✅ 텍스트 입력 완료 ({len(content)} 글자)")
                 break
             except Exception:
@@ -287,19 +399,21 @@ class NotebookLMPipeline:
         ]
         
         for selector in confirm_selectors:
+            self.tick_metrics()
+            timeout = self.deadline.timeout_ms(5000)
             try:
                 btn = self.page.locator(selector).first
-                btn.wait_for(timeout=5000, state="visible")
-                btn.click()
+                btn.wait_for(timeout=timeout, state="visible")
+                btn.click(timeout=self.deadline.timeout_ms(5000))
                 print(f"✅ 소스 삽입 완료")
                 break
             except Exception:
                 continue
         
-        time.sleep(3)
+        self.wait(3)
 
-    def generate_report(self) -> str:
-        """보고서(기획서)를 생성하고 텍스트를 반환합니다."""
+    def submit_report_prompt(self):
+        """채팅 입력창에 기획서 생성 요청을 전송합니다."""
         print("📊 기획서 생성 중...")
         
         # 채팅 입력창에 기획서 생성 요청
@@ -311,40 +425,102 @@ class NotebookLMPipeline:
             "textarea",
         ]
         
-        prompt = "위 아이디어를 바탕으로 상세한 PRD(Product Requirements Document) 기획서를 한국어로 작성해주세요. 제품 개요, 타겟 사용자, 핵심 기능, 기술 스택, 수익 모델, 개발 로드맵을 포함해주세요."
-        
         for selector in chat_selectors:
+            self.tick_metrics()
+            timeout = self.deadline.timeout_ms(10000)
             try:
                 area = self.page.locator(selector).first
-                area.wait_for(timeout=10000, state="visible")
-                area.fill(prompt)
-                area.press("Enter")
+                area.wait_for(timeout=timeout, state="visible")
+                area.fill(REPORT_PROMPT, timeout=self.deadline.timeout_ms(10000))
+                area.press("Enter", timeout=self.deadline.timeout_ms(5000))
                 print(f"✅ 기획서 생성 요청 전송")
                 break
             except Exception:
                 continue
+
+    def read_latest_response(self) -> tuple:
+        """현재 화면의 응답 노드 상태를 읽습니다.
         
-        # 응답 대기 (최대 60초)
-        print("⏳ 기획서 생성 대기 중... (최대 60초)")
-        time.sleep(60)
-        
-        # 응답 텍스트 추출
-        response_selectors = [
-            ".response-text",
-            ".chat-response",
-            "[data-testid='response']",
-            ".message-content",
-        ]
-        
-        for selector in response_selectors:
+        Returns:
+            (selector, 노드 개수, 마지막 노드 텍스트). 응답 노드가 없으면 (None, 0, "")
+        """
+        for selector in RESPONSE_SELECTORS:
             try:
-                response = self.page.locator(selector).last
-                text = response.inner_text()
-                if text and len(text) > 100:
-                    print(f"✅ 기획서 추출 완료 ({len(text)} 글자)")
-                    return text
+                nodes = self.page.locator(selector)
+                count = nodes.count()
+                if count == 0:
+                    continue
+                text = nodes.last.inner_text(timeout=self.deadline.timeout_ms(5000))
+                return selector, count, text or ""
             except Exception:
                 continue
+        return None, 0, ""
+
+    def stream_report(
+        self,
+        max_wait: float = 60,
+        poll_interval: float = 1.0,
+        settle_time: float = 5.0,
+    ):
+        """응답 노드를 폴링하며 새로 생성된 텍스트 조각을 yield 합니다.
+        
+        요청 전송 전에 화면에 있던 응답 노드(소스 요약, 이전 메시지)를 기록해 두고,
+        새로 생긴 노드이거나 텍스트가 바뀐 노드만 이번 기획서 응답으로 취급합니다.
+        
+        Yields:
+            (status, text) 튜플
+            - ("delta", 새로 추가된 텍스트)
+            - ("reset", 전체 텍스트)  응답이 앞부분부터 다시 렌더링된 경우
+        
+        텍스트가 settle_time 동안 변하지 않으면 (그리고 충분히 길면) 완료로 보고
+        종료합니다. 최대 max_wait 초까지 기다립니다.
+        """
+        baseline = self.read_latest_response()
+        self.submit_report_prompt()
+        max_wait = self.deadline.timeout_sec(max_wait)
+        print(f"⏳ 기획서 생성 대기 중... (최대 {max_wait:.0f}초)")
+        
+        wait_until = time.monotonic() + max_wait
+        last_text = ""
+        last_change = time.monotonic()
+        
+        while time.monotonic() < wait_until:
+            selector, count, text = self.read_latest_response()
+            if (selector, count, text) == baseline or (selector == baseline[0] and count < baseline[1]):
+                # 아직 새 응답이 없음 - 기존 노드 텍스트는 기획서가 아님
+                text = ""
+            elif text.strip() == REPORT_PROMPT:
+                # 방금 보낸 사용자 메시지 말풍선 - 응답이 아직 시작되지 않음
+                text = ""
+            now = time.monotonic()
+            
+            if text != last_text:
+                if text.startswith(last_text):
+                    yield "delta", text[len(last_text):]
+                else:
+                    yield "reset", text
+                last_text = text
+                last_change = now
+            elif len(last_text) > 100 and now - last_change >= settle_time:
+                break
+            
+            self.wait(poll_interval)
+
+    def generate_report(self, on_delta=None) -> str:
+        """보고서(기획서)를 생성하고 텍스트를 반환합니다.
+        
+        Args:
+            on_delta: (status, text) 를 받는 콜백. 생성 중인 텍스트를 실시간으로 전달받습니다.
+        """
+        text = ""
+        for status, chunk in self.stream_report():
+            text = text + chunk if status == "delta" else chunk
+            if on_delta:
+                on_delta(status, chunk)
+        
+        if text and len(text) > 100:
+            print(f"✅ 기획서 추출 완료 ({len(text)} 글자)")
+            return text
         
         return "기획서 텍스트 추출 실패 - NotebookLM 화면을 직접 확인하세요."
 
@@ -366,23 +542,45 @@ class NotebookLMPipeline:
         return output_path
 
 
+def _saving_to_store(pain_points, store):
+    """불편사항을 그대로 흘려보내면서 저장소에도 넣습니다 (한 번만 순회)."""
+    for point in pain_points:
+        store.save_pain_point(point)
+        yield point
+
+
 def run_pipeline(
     idea: str,
-    pain_points: list = None,
+    pain_points=None,
     headless: bool = True,
-    title: str = None
+    title: str = None,
+    on_event=None,
+    store=None,
+    profile_slot: int = None,
+    network_cache: NetworkCache = None,
+    deadline_sec: float = None,
+    metrics_interval: float = None,
+    metrics_file: str = None
 ) -> dict:
     """
     메인 파이프라인 실행
     
     Args:
         idea: 사업 아이디어 텍스트
-        pain_points: Reddit에서 수집한 불편사항 목록 (선택)
+        pain_points: Reddit에서 수집한 불편사항 목록 또는 iter_pain_points() 제너레이터 (선택)
         headless: 헤드리스 모드 여부
         title: 노트북/기획서 제목 (없으면 자동 생성)
+        on_event: (step, status, delta, **extra) 진행 이벤트 콜백 (make_jsonl_emitter 참고)
+        store: core.storage.Store (선택) - 불편사항/기획서를 DB에 비동기 배치 저장
+        profile_slot: 영구 브라우저 프로필 슬롯 번호 (선택, 워커마다 다르게)
+        network_cache: 네트워크 record/replay 설정 (선택)
+        deadline_sec: 작업 전체 시간 예산(초). 초과 시 즉시 실패하고 단계별 소요 시간을 보고 (선택)
+        metrics_interval: 브라우저 리소스 샘플링 주기(초). 0이면 단계 경계에서만, None이면 수집 안 함
+        metrics_file: 작업별 리소스 요약을 누적 저장할 JSONL 경로 (기본: output/metrics/jobs.jsonl)
     
     Returns:
-        dict: {notebook_url, plan_text, plan_file}
+        dict: {notebook_url, plan_text, plan_file, timings, metrics}
+              실패 시 {error, timings, deadline, metrics}
     """
     if not title:
         title = idea[:50] + "..." if len(idea) > 50 else idea
@@ -392,42 +590,100 @@ def run_pipeline(
     print(f"📌 아이디어: {title}")
     print(f"{'='*60}\n")
     
-    pipeline = NotebookLMPipeline(headless=headless)
+    deadline = Deadline(deadline_sec)
+    timings = deadline.steps
+    
+    def emit(step, status, *args, **kwargs):
+        # 단계별 소요 시간 기록 (replay 모드 성능 기준선 / 예산 소진 단계 보고에 사용)
+        if status == "start":
+            deadline.begin(STEP_NAMES[step])
+        elif status == "done" and step in STEP_NAMES:
+            deadline.end(STEP_NAMES[step])
+            if pipeline.metrics:
+                pipeline.metrics.sample(STEP_NAMES[step])
+        if on_event:
+            on_event(step, status, *args, **kwargs)
+    
+    pipeline = NotebookLMPipeline(
+        headless=headless,
+        profile_slot=profile_slot,
+        network_cache=network_cache,
+        deadline=deadline,
+        metrics_interval=metrics_interval
+    )
+    
+    def collect_metrics() -> dict:
+        if not pipeline.metrics:
+            return None
+        summary = pipeline.metrics.summary()
+        export_job(summary, job=title, path=metrics_file)
+        print(f"📈 브라우저 리소스: {summary.get('peak')}")
+        return summary
     
     try:
+        emit(0, "start")
         pipeline.start()
+        emit(0, "done")
         
         # 1. 소스 텍스트 준비
+        emit(1, "start")
+        if store and pain_points:
+            # 제너레이터도 한 번만 순회하도록 소스를 만들면서 저장소에 함께 넣음
+            pain_points = _saving_to_store(pain_points, store)
         source_content = format_idea_as_source(idea, pain_points)
+        emit(1, "done")
         
         # 2. 노트북 생성
+        emit(2, "start")
         notebook_url = pipeline.create_notebook(title)
+        emit(2, "done", url=notebook_url)
         
         # 3. 소스 추가
+        emit(3, "start")
         pipeline.add_text_source(source_content, title)
+        emit(3, "done")
         
-        # 4. 기획서 생성
-        plan_text = pipeline.generate_report()
+        # 4. 기획서 생성 (생성 중인 텍스트를 delta 이벤트로 중계)
+        emit(4, "start")
+        plan_text = pipeline.generate_report(
+            on_delta=lambda status, chunk: emit(4, status, chunk)
+        )
+        emit(4, "done")
         
         # 5. 저장
+        emit(5, "start")
         plan_file = pipeline.save_plan(title, plan_text)
+        if store:
+            store.save_plan(title, plan_text, idea=idea, notebook_url=notebook_url, plan_file=str(plan_file))
+        emit(5, "done", plan_file=str(plan_file))
         
+        emit(FINAL_STEP, "done", url=notebook_url)
         print(f"\n✅ 파이프라인 완료!")
         print(f"📓 노트북: {notebook_url}")
         print(f"📄 기획서: {plan_file}")
+        print(f"⏱️ 단계별 소요 시간(초): {timings}")
         
         return {
             "success": True,
             "notebook_url": notebook_url,
             "plan_text": plan_text,
-            "plan_file": str(plan_file)
+            "plan_file": str(plan_file),
+            "timings": timings,
+            "metrics": collect_metrics()
         }
         
     except Exception as e:
+        # 예산 초과로 인한 Playwright 타임아웃 등도 예산 소진으로 보고
+        if deadline.expired() and not isinstance(e, DeadlineExceeded):
+            e = DeadlineExceeded(deadline.current_step, deadline.report())
         print(f"\n❌ 파이프라인 오류: {e}")
+        emit(FINAL_STEP, "error", error=str(e))
         return {
             "success": False,
-            "error": str(e)
+            "error": str(e),
+            "timings": timings,
+            "deadline": deadline.report(),
+            "metrics": collect_metrics()
         }
     finally:
         pipeline.stop()
@@ -448,7 +704,18 @@ if __name__ == "__main__":
     parser.add_argument(
         "--pain-points-file",
         type=str,
-        help="Reddit 불편사항 JSON 파일 경로 (스크래핑 모드)"
+        help="Reddit 불편사항 JSON/JSONL 파일 경로 (스크래핑 모드)"
+    )
+    parser.add_argument(
+        "--max-source-chars",
+        type=int,
+        default=200_000,
+        help="소스에 넣을 불편사항 최대 글자 수 (0 = 제한 없음)"
+    )
+    parser.add_argument(
+        "--keyword",
+        type=str,
+        help="이 키워드를 포함한 불편사항만 사용"
     )
     parser.add_argument(
         "--title",
@@ -460,9 +727,56 @@ if __name__ == "__main__":
         action="store_true",
         help="브라우저 창 표시 (디버깅용)"
     )
+    parser.add_argument(
+        "--profile-slot",
+        type=int,
+        help="영구 브라우저 프로필 슬롯 번호 (캐시 재사용으로 첫 로딩 단축)"
+    )
+    parser.add_argument(
+        "--net-mode",
+        choices=["off", "record", "replay"],
+        default="off",
+        help="네트워크 응답 기록(record) / 로컬 아카이브 재생(replay)"
+    )
+    parser.add_argument(
+        "--net-archive",
+        type=str,
+        help="HAR 아카이브 경로 (기본: ~/.cloud-shield/network/default.har.zip)"
+    )
+    parser.add_argument(
+        "--net-offline",
+        action="store_true",
+        help="replay 시 아카이브에 없는 URL은 네트워크로 보내지 않고 차단"
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        help="작업 전체 시간 예산(초). 초과 시 즉시 실패"
+    )
+    parser.add_argument(
+        "--metrics-interval",
+        type=float,
+        help="브라우저 리소스(JS 힙/DOM/CPU/네트워크) 샘플링 주기(초). 0 = 단계 경계에서만"
+    )
+    parser.add_argument(
+        "--db",
+        type=str,
+        help="결과 저장소 URL (sqlite:///path.db, postgresql://..., supabase)"
+    )
+    parser.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="stdout에 {step,status,delta} JSON-lines 이벤트 출력 (로그는 stderr로)"
+    )
     
     args = parser.parse_args()
     
+    # 대용량 스크래핑 덤프도 스트리밍으로 읽으며 필터/예산을 바로 적용
+    pain_point_filters = {
+        "keyword": args.keyword,
+        "max_chars": args.max_source_chars or None,
+    }
+    
     # 아이디어 결정
     idea = args.idea
     pain_points = None
@@ -478,31 +792,53 @@ if __name__ == "__main__":
         if choice == "1":
             idea = input("💡 아이디어를 입력하세요: ").strip()
         elif choice == "2":
-            file_path = input("📁 불편사항 JSON 파일 경로: ").strip()
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            pain_points = data if isinstance(data, list) else data.get("pain_points", [])
+            file_path = input("📁 불편사항 JSON/JSONL 파일 경로: ").strip()
+            pain_points = iter_pain_points(file_path, **pain_point_filters)
             idea = input("💡 선택한 아이디어를 입력하세요: ").strip()
         else:
             print("❌ 잘못된 선택")
             sys.exit(1)
     
+    # 파일은 파이프라인 1단계(소스 준비)에서 한 번만 스트리밍으로 읽힘
     if args.pain_points_file:
-        with open(args.pain_points_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        pain_points = data if isinstance(data, list) else data.get("pain_points", [])
+        pain_points = iter_pain_points(args.pain_points_file, **pain_point_filters)
     
     # 파이프라인 실행
-    result = run_pipeline(
-        idea=idea,
-        pain_points=pain_points,
-        headless=not args.no_headless,
-        title=args.title
-    )
+    # --jsonl: stdout은 이벤트 전용, 사람이 읽는 로그는 stderr로 보냄
+    on_event = make_jsonl_emitter(sys.stdout) if args.jsonl else None
+    log_stream = sys.stderr if args.jsonl else sys.stdout
+    
+    with contextlib.redirect_stdout(log_stream):
+        store = None
+        if args.db:
+            from core.storage import Store, open_backend
+            store = Store(open_backend(args.db))
+        
+        try:
+            result = run_pipeline(
+                idea=idea,
+                pain_points=pain_points,
+                headless=not args.no_headless,
+                title=args.title,
+                on_event=on_event,
+                store=store,
+                profile_slot=args.profile_slot,
+                network_cache=NetworkCache(args.net_mode, args.net_archive, passthrough=not args.net_offline),
+                deadline_sec=args.deadline,
+                metrics_interval=args.metrics_interval
+            )
+        finally:
+            if store:
+                # 저장 실패가 파이프라인 결과 출력/최종 이벤트를 가리지 않도록 로그만 남김
+                try:
+                    store.close()
+                except Exception as e:
+                    print(f"⚠️ 결과 저장소 기록 실패: {e}")
+        
+        if result["success"]:
+            print(f"\n🎉 성공! 기획서가 생성되었습니다.")
+            print(f"📄 파일: {result['plan_file']}")
     
-    if result["success"]:
-        print(f"\n🎉 성공! 기획서가 생성되었습니다.")
-        print(f"📄 파일: {result['plan_file']}")
-    else:
-        print(f"\n❌ 실패: {result['error']}")
+    if not result["success"]:
+        print(f"\n❌ 실패: {result['error']}", file=log_stream)
         sys.exit(1)
@@ -0,0 +1,42 @@
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.deadline import Deadline, DeadlineExceeded
+
+
+def test_unbounded_keeps_original_timeouts():
+    deadline = Deadline()
+    assert deadline.timeout_ms(30000) == 30000
+    assert deadline.timeout_sec(60) == 60
+
+
+def test_timeouts_are_capped_by_remaining_budget():
+    deadline = Deadline(0.5)
+    assert 1 <= deadline.timeout_ms(30000) <= 500
+    assert deadline.timeout_sec(60) <= 0.5
+
+
+def test_expiry_between_steps_is_blamed_on_the_step_that_spent_it():
+    deadline = Deadline(0.05)
+    deadline.begin("create_notebook")
+    time.sleep(0.06)
+    deadline.end("create_notebook")
+
+    with pytest.raises(DeadlineExceeded) as exc:
+        deadline.begin("add_source")
+    assert exc.value.step == "create_notebook"
+    assert exc.value.report["exhausted_by"] == "create_notebook"
+    assert "add_source" not in exc.value.report["steps"]
+
+
+def test_sleep_stops_at_the_budget():
+    deadline = Deadline(0.05)
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        deadline.sleep(5)
+    assert time.monotonic() - start < 1
@@ -0,0 +1,73 @@
+import os
+import sys
+import types
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import google.generativeai  # noqa: F401
+except ImportError:
+    # The Gemini SDK is only needed for fix_selector's model call
+    google = sys.modules.setdefault("google", types.ModuleType("google"))
+    google.generativeai = sys.modules["google.generativeai"] = types.ModuleType("google.generativeai")
+
+from core.healer import Healer
+
+
+class StubPage:
+    """Answers the verification script with canned per-selector results."""
+
+    def __init__(self, results):
+        self.results = results
+
+    def evaluate(self, script, selectors):
+        return [{"selector": s, **self.results[s]} for s in selectors]
+
+
+def hit(count, visible=None, cost_ms=0.1):
+    return {"valid": True, "count": count, "visible": count if visible is None else visible, "cost_ms": cost_ms}
+
+
+PAGE = StubPage({
+    "h1.title": hit(1),
+    "shreddit-post h1": hit(25),
+    "article h1": hit(25, visible=3),
+    "div": hit(900, visible=0),
+    "none": hit(0),
+    "bad[": {"valid": False, "count": 0, "visible": 0, "cost_ms": 0},
+})
+
+
+# Skips __init__ (Gemini setup); pick_best only talks to the page
+healer = object.__new__(Healer)
+
+
+def test_single_element_key_prefers_unique_match():
+    candidates = ["shreddit-post h1", "h1.title", "div"]
+    assert healer.pick_best(PAGE, candidates, target_key="add_source_btn") == "h1.title"
+    assert healer.pick_best(PAGE, candidates, target_key="chat_input") == "h1.title"
+
+
+def test_list_key_prefers_most_visible_matches():
+    candidates = ["h1.title", "article h1", "shreddit-post h1", "div"]
+    assert healer.pick_best(PAGE, candidates, target_key="post_title") == "shreddit-post h1"
+
+
+def test_no_match_returns_none():
+    assert healer.pick_best(PAGE, ["none", "bad["], target_key="post_title") is None
+
+
+def test_parse_candidates_shapes():
+    parse = Healer._parse_candidates
+    assert parse('["a", "b", "a"]') == ["a", "b"]
+    assert parse('```json\n["a"]\n```') == ["a"]
+    assert parse('"only"') == ["only"]
+    assert parse("div.a\ndiv.b\n") == ["div.a", "div.b"]
+
+
+def test_parse_candidates_rejects_other_json():
+    parse = Healer._parse_candidates
+    assert parse("42") == []
+    assert parse('{"selectors": ["a"]}') == []
+    assert parse("null") == []
+    assert parse('["a", 3, {"b": 1}]') == ["a"]
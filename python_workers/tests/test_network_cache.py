@@ -0,0 +1,51 @@
+import os
+import sys
+import json
+import zipfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.network_cache import NetworkCache, scrub_archive
+
+
+def har():
+    return {"log": {"entries": [{
+        "request": {
+            "url": "https://notebooklm.google.com/",
+            "headers": [{"name": "Cookie", "value": "SID=secret; NID=secret"}, {"name": "Accept", "value": "*/*"}],
+            "cookies": [{"name": "SID", "value": "secret"}],
+        },
+        "response": {
+            "headers": [{"name": "set-cookie", "value": "SID=rotated"}, {"name": "Content-Type", "value": "text/html"}],
+            "cookies": [],
+            "content": {"_file": "abc.html"},
+        },
+    }]}}
+
+
+def test_scrub_har_zip_keeps_bodies(tmp_path):
+    path = tmp_path / "run.har.zip"
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr("har.har", json.dumps(har()))
+        z.writestr("abc.html", "<html>body</html>")
+
+    assert scrub_archive(path) == 3
+
+    with zipfile.ZipFile(path) as z:
+        entry = json.loads(z.read("har.har"))["log"]["entries"][0]
+        assert z.read("abc.html") == b"<html>body</html>"
+    assert "secret" not in json.dumps(entry) and "rotated" not in json.dumps(entry)
+    assert entry["request"]["headers"] == [{"name": "Accept", "value": "*/*"}]
+    assert entry["response"]["headers"] == [{"name": "Content-Type", "value": "text/html"}]
+
+
+def test_scrub_plain_har(tmp_path):
+    path = tmp_path / "run.har"
+    path.write_text(json.dumps(har()), encoding="utf-8")
+    scrub_archive(path)
+    assert "secret" not in path.read_text(encoding="utf-8")
+
+
+def test_default_archive_is_outside_repo():
+    repo = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert not str(NetworkCache("record").archive.resolve()).startswith(repo)
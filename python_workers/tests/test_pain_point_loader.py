@@ -0,0 +1,81 @@
+import os
+import sys
+import json
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import pain_point_loader
+from core.pain_point_loader import iter_records, load_pain_points
+
+
+@pytest.fixture(autouse=True)
+def tiny_chunks(monkeypatch):
+    # Force values to straddle chunk boundaries
+    monkeypatch.setattr(pain_point_loader, "CHUNK_SIZE", 7)
+
+
+def write(tmp_path, text, name="dump.json"):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_json_array(tmp_path):
+    path = write(tmp_path, json.dumps(["first pain", {"title": "t", "text": "body"}, 12345]))
+    assert list(iter_records(path)) == ["first pain", {"title": "t", "text": "body"}, 12345]
+
+
+def test_empty_array(tmp_path):
+    assert list(iter_records(write(tmp_path, "[ ]"))) == []
+
+
+def test_arrays_back_to_back(tmp_path):
+    path = write(tmp_path, '["a", "b"]\n["c"]\n"d"\n', "dump.jsonl")
+    assert list(iter_records(path)) == ["a", "b", "c", "d"]
+
+
+def test_malformed_trailing_input_raises(tmp_path):
+    with pytest.raises(ValueError):
+        list(iter_records(write(tmp_path, '["a"] oops')))
+
+
+def test_wrapped_object_pretty_printed(tmp_path):
+    data = {"meta": {"source": "reddit", "ids": [1, 2]}, "pain_points": ["p1", "p2"], "after": 1}
+    path = write(tmp_path, json.dumps(data, indent=2))
+    assert list(iter_records(path)) == ["p1", "p2"]
+
+
+def test_wrapped_object_single_line(tmp_path):
+    path = write(tmp_path, json.dumps({"pain_points": ["p1", "p2"]}))
+    assert list(iter_records(path)) == ["p1", "p2"]
+
+
+def test_jsonl(tmp_path):
+    path = write(tmp_path, '{"text": "l1"}\n{"text": "l2"}\n', "dump.jsonl")
+    assert list(iter_records(path)) == [{"text": "l1"}, {"text": "l2"}]
+
+
+def test_jsonl_single_record(tmp_path):
+    path = write(tmp_path, '{"text": "only one"}\n', "dump.jsonl")
+    assert list(iter_records(path)) == [{"text": "only one"}]
+
+
+def test_jsonl_first_record_with_pain_points_field(tmp_path):
+    lines = [{"text": "l1", "pain_points": ["nested"]}, {"text": "l2"}]
+    path = write(tmp_path, "\n".join(json.dumps(r) for r in lines) + "\n", "dump.jsonl")
+    assert list(iter_records(path)) == lines
+
+
+def test_jsonl_of_strings(tmp_path):
+    path = write(tmp_path, '"s1"\n"s2"\n', "dump.jsonl")
+    assert list(iter_records(path)) == ["s1", "s2"]
+
+
+def test_filters_and_budget(tmp_path, capsys):
+    path = write(tmp_path, json.dumps(["x" * 10] * 20 + ["slow export"]))
+    assert load_pain_points(path, max_chars=35) == ["x" * 10] * 3
+    assert "kept 3 pain point(s)" in capsys.readouterr().out
+    assert load_pain_points(path, max_items=2) == ["x" * 10] * 2
+    assert load_pain_points(path, keyword="EXPORT") == ["slow export"]
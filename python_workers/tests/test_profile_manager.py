@@ -0,0 +1,48 @@
+import os
+import sys
+import subprocess
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.profile_manager import ProfileManager
+
+
+def test_slot_is_exclusive_until_released(tmp_path):
+    first, second = ProfileManager(str(tmp_path)), ProfileManager(str(tmp_path))
+    first.acquire(0)
+
+    with pytest.raises(RuntimeError, match="in use"):
+        second.acquire(0)
+    second.acquire(1)  # other slots are independent
+
+    first.release(0)
+    assert second.acquire(0) == tmp_path / "slot-0"
+    second.release(0)
+    second.release(1)
+
+
+def test_release_of_unheld_slot_is_noop(tmp_path):
+    first, second = ProfileManager(str(tmp_path)), ProfileManager(str(tmp_path))
+    first.acquire(0)
+    second.release(0)  # must not free first's lock
+
+    with pytest.raises(RuntimeError):
+        second.acquire(0)
+    first.release(0)
+
+
+def test_lock_of_dead_worker_is_not_stale(tmp_path):
+    # A worker that exits without release() (crash, kill -9) must not block the slot
+    code = (
+        "import sys; sys.path.insert(0, sys.argv[1]); "
+        "from core.profile_manager import ProfileManager; "
+        "ProfileManager(sys.argv[2]).acquire(0); import os; os._exit(1)"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", code, root, str(tmp_path)], check=False)
+
+    manager = ProfileManager(str(tmp_path))
+    manager.acquire(0)
+    manager.release(0)
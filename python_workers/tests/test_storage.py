@@ -0,0 +1,106 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import storage
+from core.storage import SQLiteBackend, Store
+
+
+class FlakyBackend(SQLiteBackend):
+    """Fails the first `failures` upserts, then behaves normally."""
+
+    def __init__(self, failures: int):
+        super().__init__()
+        self.failures = failures
+        self.calls = 0
+
+    def upsert(self, table, rows):
+        self.calls += 1
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("connection reset")
+        super().upsert(table, rows)
+
+
+def created_at(backend, table="pain_points"):
+    conn = backend._pool.get()
+    try:
+        return [r[0] for r in conn.execute(f"SELECT created_at FROM {table}")]
+    finally:
+        backend._pool.put(conn)
+
+
+def test_resave_is_noop_and_keeps_created_at(monkeypatch):
+    backend = SQLiteBackend()
+    store = Store(backend)
+
+    monkeypatch.setattr(storage.time, "strftime", lambda fmt: "2026-01-01T00:00:00")
+    store.save_pain_point("export is slow")
+    store.save_plan("Plan", "content", idea="idea")
+    store.flush()
+
+    monkeypatch.setattr(storage.time, "strftime", lambda fmt: "2026-01-02T00:00:00")
+    store.save_pain_point("export is slow")
+    store.save_plan("Plan", "content", idea="idea")
+    store.flush()
+
+    assert backend.count("pain_points") == 1
+    assert backend.count("plans") == 1
+    assert created_at(backend) == ["2026-01-01T00:00:00"]
+    assert created_at(backend, "plans") == ["2026-01-01T00:00:00"]
+    store.close()
+
+
+def test_rows_are_written_in_batches(tmp_path):
+    db = str(tmp_path / "store.db")
+    # Long interval: only full batches and close() trigger a write
+    store = Store(SQLiteBackend(db), batch_size=10, flush_interval=60)
+    store.save_pain_points(f"pain {i}" for i in range(25))
+    store.close()
+
+    assert store.stats["rows"] == 25
+    assert store.stats["batches"] == 3
+    assert SQLiteBackend(db).count("pain_points") == 25
+
+
+def test_duplicates_within_a_batch_are_merged(tmp_path):
+    db = str(tmp_path / "store.db")
+    store = Store(SQLiteBackend(db), batch_size=100, flush_interval=60)
+    store.save_pain_points(["same"] * 5)
+    store.close()
+
+    assert store.stats["rows"] == 1
+    assert store.stats["batches"] == 1
+    assert SQLiteBackend(db).count("pain_points") == 1
+
+
+def test_failed_batch_is_retried():
+    backend = FlakyBackend(failures=2)
+    store = Store(backend, max_retries=3, retry_backoff=0.001)
+    store.save_pain_point("eventually stored")
+    store.flush()
+
+    assert backend.count("pain_points") == 1
+    assert store.stats["retries"] == 2
+    assert store.stats["failed_rows"] == 0
+    store.close()
+
+
+def test_dropped_batch_is_reported_once_and_later_saves_still_work():
+    backend = FlakyBackend(failures=2)
+    store = Store(backend, max_retries=1, retry_backoff=0.001)
+    store.save_pain_point("lost")
+
+    with pytest.raises(RuntimeError, match="dropped 1 row"):
+        store.flush()
+    store.flush()  # already reported
+
+    store.save_pain_point("stored")
+    store.flush()
+
+    assert backend.count("pain_points") == 1
+    assert store.stats["failed_rows"] == 1
+    store.close()